@@ -5,7 +5,14 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import time
 import os
+import threading
+import weakref
+import glob
 import pytz
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from supabase import create_client, Client
 
 st.set_page_config(
@@ -16,6 +23,25 @@ st.set_page_config(
 )
 
 IST = pytz.timezone('Asia/Kolkata')
+REFRESH_SECONDS = 10
+SENTIMENTS = ["Positive", "Neutral", "Negative"]
+PRIORITIES = ["High", "Medium", "Low"]
+
+# Long text columns stay in the database and are fetched per submission on demand
+COMPACT_COLUMNS = ['id', 'timestamp', 'rating', 'review', 'ai_summary']
+DETAIL_COLUMNS = ['ai_response', 'recommended_actions']
+
+# Fixed schema so incremental syncs can be appended to the shared snapshot
+FEEDBACK_SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('ts', pa.int64()),
+    ('date', pa.timestamp('s')),
+    ('rating', pa.int8()),
+    ('sentiment', pa.dictionary(pa.int8(), pa.string())),
+    ('priority', pa.dictionary(pa.int8(), pa.string())),
+    ('review', pa.string()),
+    ('ai_summary', pa.string()),
+])
 
 st.markdown("""
 <style>
@@ -175,6 +201,14 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     st.error("⚠️ Supabase credentials not found")
     st.stop()
 
+# Retention: dashboards query only the hot window; older months can be archived to Parquet
+try:
+    HOT_WINDOW_DAYS = int(st.secrets["HOT_WINDOW_DAYS"])
+    ARCHIVE_DIR = st.secrets["ARCHIVE_DIR"]
+except:
+    HOT_WINDOW_DAYS = int(os.getenv("HOT_WINDOW_DAYS", "90"))
+    ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "feedback_archive")
+
 @st.cache_resource
 def get_supabase():
     return create_client(SUPABASE_URL, SUPABASE_KEY)
@@ -187,20 +221,289 @@ if 'date_filter' not in st.session_state:
 if 'confirm_clear' not in st.session_state:
     st.session_state.confirm_clear = False
 
-def load_data():
+def hot_cutoff():
+    """Start of the hot window: the first IST day of the month HOT_WINDOW_DAYS ago.
+
+    Archival moves exactly the rows before this point, so hot and archived
+    data always meet on a month boundary.
+    """
+    start = datetime.now(IST) - timedelta(days=HOT_WINDOW_DAYS)
+    return start.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+def fetch_feedback_table(after_id=None, cold=False):
+    """Compact Arrow table of hot-window feedback rows (or, with cold=True, unarchived older rows)."""
+    cutoff = hot_cutoff().isoformat()
+
+    def build_query():
+        query = supabase.table('feedback').select(', '.join(COMPACT_COLUMNS))
+        query = query.lt('timestamp', cutoff) if cold else query.gte('timestamp', cutoff)
+        if after_id is not None:
+            query = query.gt('id', after_id)
+        return query.order('timestamp', desc=True).order('id', desc=True)
+
+    return compact_table(pd.DataFrame(fetch_all_rows(build_query), columns=COMPACT_COLUMNS))
+
+def compact_table(raw):
+    """Build the compact Arrow table from raw feedback rows.
+
+    rating is int8, sentiment/priority are categoricals, ts is epoch seconds
+    and date is the IST day. ai_response/recommended_actions are left out.
+    """
+    timestamp = pd.to_datetime(raw['timestamp'], utc=True, format='ISO8601')
+    rating = raw['rating'].astype('int8')
+    compact = pd.DataFrame({
+        'id': raw['id'].astype('int64'),
+        'ts': (timestamp - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1),
+        'date': timestamp.dt.tz_convert(IST).dt.tz_localize(None).dt.normalize(),
+        'rating': rating,
+        'sentiment': pd.Categorical(rating.map(get_sentiment), categories=SENTIMENTS),
+        'priority': pd.Categorical(rating.map(get_priority), categories=PRIORITIES),
+        'review': raw['review'],
+        'ai_summary': raw['ai_summary'],
+    })
+    return pa.Table.from_pandas(compact, schema=FEEDBACK_SCHEMA, preserve_index=False)
+
+class FeedbackStore(dict):
+    """Plain dict that can be weakly referenced by its refresher thread."""
+
+@st.cache_resource(show_spinner=False)
+def get_feedback_store():
+    """Process-wide feedback snapshot, kept fresh by a single refresher thread.
+
+    Sessions only read store['snapshot'] (an immutable Arrow table), so the
+    database sees one sync every REFRESH_SECONDS however many admins are open.
+    """
+    store = FeedbackStore({
+        'condition': threading.Condition(),
+        'snapshot': fetch_feedback_table(),
+        'error': None,
+        'generation': 0,         # bumped by invalidate_feedback()
+        'loaded_generation': 0,  # generation of the last full reload
+    })
+    # The thread only holds a weakref, so it stops once Streamlit discards this store
+    threading.Thread(target=refresh_feedback_store, args=(weakref.ref(store),), daemon=True).start()
+    return store
+
+def refresh_feedback_store(store_ref):
+    """Refresher loop: append new rows every REFRESH_SECONDS, full reload when invalidated.
+
+    Exits when the store has been discarded (cache cleared or code reloaded),
+    since the replacement store starts its own refresher.
+    """
+    while True:
+        store = store_ref()
+        if store is None:
+            return
+
+        condition = store['condition']
+        with condition:
+            condition.wait_for(lambda: store['generation'] > store['loaded_generation'], timeout=REFRESH_SECONDS)
+            generation = store['generation']
+            full_reload = generation > store['loaded_generation']
+            snapshot = store['snapshot']
+
+        try:
+            if full_reload or snapshot.num_rows == 0:
+                snapshot = fetch_feedback_table()
+            else:
+                new_rows = fetch_feedback_table(after_id=pc.max(snapshot['id']).as_py())
+                if new_rows.num_rows > 0:
+                    snapshot = pa.concat_tables([new_rows, snapshot])
+                # Drop rows that have aged out of the hot window
+                cutoff_ts = int(hot_cutoff().timestamp())
+                snapshot = snapshot.filter(pc.greater_equal(snapshot['ts'], pa.scalar(cutoff_ts, pa.int64())))
+            error = None
+        except Exception as e:
+            error = str(e)
+
+        with condition:
+            store['error'] = error
+            if error is None:
+                store['snapshot'] = snapshot
+                if full_reload:
+                    store['loaded_generation'] = generation
+            condition.notify_all()
+
+        store = None  # don't keep the store alive between cycles
+        if error is not None:
+            time.sleep(REFRESH_SECONDS)  # back off instead of retrying a failed reload in a tight loop
+
+def invalidate_feedback(timeout=10):
+    """Force a full reload of the shared snapshot and wait (briefly) until it lands."""
+    store = get_feedback_store()
+    condition = store['condition']
+    with condition:
+        store['generation'] += 1
+        target = store['generation']
+        condition.notify_all()
+        condition.wait_for(lambda: store['loaded_generation'] >= target, timeout=timeout)
+
+def arrow_strings(arrow_type):
+    # Keep text as Arrow-backed strings so sessions share the cached buffers
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype('pyarrow')
+    return None
+
+def archive_files():
+    return sorted(glob.glob(os.path.join(ARCHIVE_DIR, "feedback_*.parquet")))
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_archive_table(signature):
+    """Compact table of all archived months; signature (files + mtimes) keys the cache."""
+    if not signature:
+        return None
+    archived = ds.dataset([path for path, _ in signature], format='parquet').to_table(columns=COMPACT_COLUMNS)
+    # A retried batch can leave the same rows in two part files
+    return compact_table(archived.to_pandas().drop_duplicates('id'))
+
+@st.cache_resource(ttl=60, show_spinner=False)
+def load_unarchived_table():
+    """Rows older than the hot window that are still in Supabase (not archived yet)."""
+    return fetch_feedback_table(cold=True)
+
+def archive_signature():
+    return tuple((path, os.path.getmtime(path)) for path in archive_files())
+
+def archive_old_feedback(batch_size=500):
+    """Move every row before the hot window (whole months) into monthly Parquet part files.
+
+    Each batch becomes its own feedback_YYYY_MM_<first_id>.parquet, written to a
+    temp file and renamed into place, so existing archive files are never
+    rewritten. Rows are deleted from Supabase only after their part file exists.
+    Returns the number of rows archived.
+    """
     try:
-        response = supabase.table('feedback').select('*').order('timestamp', desc=True).execute()
-        if response.data and len(response.data) > 0:
-            df = pd.DataFrame(response.data)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            if df['timestamp'].dt.tz is None:
-                df['timestamp'] = df['timestamp'].dt.tz_localize('UTC')
-            df['timestamp'] = df['timestamp'].dt.tz_convert(IST)
-            return df
+        supabase.rpc('ensure_feedback_partitions').execute()  # optional, see README
+    except Exception:
+        pass
+
+    cutoff = hot_cutoff()
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    archived = 0
+    while True:
+        response = supabase.table('feedback').select('*').lt('timestamp', cutoff.isoformat()) \
+            .order('id').limit(batch_size).execute()
+        if not response.data:
+            return archived
+
+        batch = pd.DataFrame(response.data)
+        batch['timestamp'] = pd.to_datetime(batch['timestamp'], utc=True, format='ISO8601')
+        batch['rating'] = batch['rating'].astype('int8')
+        months = batch['timestamp'].dt.tz_convert(IST).dt.strftime('%Y_%m')
+        for month, rows in batch.groupby(months):
+            path = os.path.join(ARCHIVE_DIR, f"feedback_{month}_{int(rows['id'].min())}.parquet")
+            tmp_path = path + ".tmp"
+            pq.write_table(pa.Table.from_pandas(rows, preserve_index=False), tmp_path, compression='zstd')
+            os.replace(tmp_path, path)
+
+        deleted = supabase.table('feedback').delete().in_('id', batch['id'].tolist()).execute()
+        if len(deleted.data or []) != len(batch):
+            # e.g. RLS blocked the delete - stop instead of re-archiving the same rows forever
+            raise RuntimeError(f"Archived {len(batch)} rows but Supabase deleted {len(deleted.data or [])}; "
+                               "check delete permissions on the feedback table")
+        archived += len(batch)
+
+def load_data(include_archive=False):
+    try:
+        store = get_feedback_store()
+        if store['error']:
+            st.error(f"Database error: {store['error']}")
+        table = store['snapshot']
+        if include_archive:
+            table = pa.concat_tables([table, load_unarchived_table()])
+            archive = load_archive_table(archive_signature())
+            if archive is not None:
+                table = pa.concat_tables([table, archive])
+        return table.to_pandas(types_mapper=arrow_strings)
     except Exception as e:
         st.error(f"Database error: {e}")
 
-    return pd.DataFrame(columns=['timestamp', 'rating', 'review', 'ai_response', 'ai_summary', 'recommended_actions'])
+    return pd.DataFrame(columns=['id', 'ts', 'date', 'rating', 'sentiment', 'priority', 'review', 'ai_summary'])
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_details(feedback_id):
+    """ai_response and recommended_actions for a single submission."""
+    response = supabase.table('feedback').select(', '.join(DETAIL_COLUMNS)).eq('id', feedback_id).execute()
+    if response.data:
+        return response.data[0]
+
+    files = archive_files()
+    if files:
+        archived = ds.dataset(files, format='parquet').to_table(columns=DETAIL_COLUMNS, filter=ds.field('id') == feedback_id)
+        if archived.num_rows > 0:
+            return archived.to_pylist()[0]
+    return {}
+
+def build_export_csv(include_archive=False):
+    """Full-text CSV export with IST timestamps, matching what the dashboard shows."""
+    def build_query():
+        query = supabase.table('feedback').select('*')
+        if not include_archive:
+            query = query.gte('timestamp', hot_cutoff().isoformat())
+        return query.order('timestamp', desc=True).order('id', desc=True)
+
+    export = pd.DataFrame(fetch_all_rows(build_query))
+    if len(export) > 0:
+        export['timestamp'] = pd.to_datetime(export['timestamp'], utc=True, format='ISO8601')
+    if include_archive and archive_files():
+        archived = ds.dataset(archive_files(), format='parquet').to_table().to_pandas()
+        export = pd.concat([export, archived]) if len(export) > 0 else archived
+    if len(export) > 0:
+        export['timestamp'] = export['timestamp'].dt.tz_convert(IST)
+        export = export.sort_values('timestamp', ascending=False)
+    return export.to_csv(index=False, encoding='utf-8-sig')
+
+PAGE_SIZE = 1000  # PostgREST's default max rows per request
+
+def fetch_all_rows(build_query):
+    """Page through a query; build_query() must return a fresh query with a stable order."""
+    rows = []
+    while True:
+        page = build_query().range(len(rows), len(rows) + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+
+@st.cache_data(ttl=REFRESH_SECONDS, show_spinner=False)
+def load_daily_rollup(start_date=None, end_date=None):
+    """Per-day, per-rating counts in IST day buckets from the feedback_daily rollup."""
+    def build_query():
+        query = supabase.table('feedback_daily').select('day, rating, count, rating_sum')
+        if start_date is not None:
+            query = query.gte('day', start_date.isoformat())
+        if end_date is not None:
+            query = query.lte('day', end_date.isoformat())
+        return query.order('day').order('rating')
+
+    try:
+        rollup = pd.DataFrame(fetch_all_rows(build_query), columns=['day', 'rating', 'count', 'rating_sum'])
+        rollup['day'] = pd.to_datetime(rollup['day']).dt.date
+        return rollup
+    except Exception:
+        return None  # rollup table not set up - caller falls back to the loaded rows
+
+def rollup_from_frame(dataframe, start_date=None, end_date=None):
+    """Same shape as load_daily_rollup, computed from already-loaded rows."""
+    rollup = dataframe.groupby(['date', 'rating']).size().reset_index(name='count')
+    rollup = rollup.rename(columns={'date': 'day'})
+    rollup['day'] = rollup['day'].dt.date
+    rollup['rating_sum'] = rollup['rating'] * rollup['count']
+    if start_date is not None:
+        rollup = rollup[rollup['day'] >= start_date]
+    if end_date is not None:
+        rollup = rollup[rollup['day'] <= end_date]
+    return rollup
+
+@st.cache_data(ttl=REFRESH_SECONDS, show_spinner=False)
+def load_model_stats():
+    """Per-model router stats published by the User app (optional table)."""
+    try:
+        response = supabase.table('model_stats').select('*').order('route_rank').execute()
+        if response.data:
+            return pd.DataFrame(response.data)
+    except Exception:
+        pass
+    return pd.DataFrame()
 
 def get_sentiment(rating):
     if rating >= 4: return "Positive"
@@ -218,9 +521,22 @@ def clear_all_data():
         # 1. Delete from database
         supabase.table('feedback').delete().neq('id', 0).execute()
 
-        # 2. Clear ALL Streamlit cache (this removes ghost UI)
-        st.cache_resource.clear()
-        st.cache_data.clear()
+        # 1b. Rebuild the daily rollup (now empty) - optional table
+        try:
+            supabase.rpc('rebuild_feedback_daily').execute()
+        except Exception:
+            pass
+
+        # 1c. Remove archived months too
+        for path in archive_files():
+            os.remove(path)
+
+        # 2. Invalidate only the feedback caches (keeps the Supabase client)
+        invalidate_feedback()
+        load_unarchived_table.clear()
+        load_daily_rollup.clear()
+        fetch_details.clear()
+        st.session_state.pop('export_csv', None)
 
         # 3. Reset session state
         st.session_state.confirm_clear = False
@@ -242,7 +558,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Load data
-df = load_data()
+df = load_data(include_archive=st.session_state.get('include_archive', False))
 
 # Show success message if just cleared (APPEARS AT TOP!)
 if 'clear_success' in st.session_state and st.session_state.clear_success:
@@ -260,10 +576,23 @@ with st.sidebar:
     st.markdown("<h2 style='color: white; margin-bottom: 1.5rem;'>⚙️ Controls</h2>", unsafe_allow_html=True)
     st.markdown("<hr style='border: 1px solid rgba(255,255,255,0.2); margin: 1.5rem 0;'>", unsafe_allow_html=True)
 
+    st.markdown("<h3 style='color: white; font-size: 1.1rem;'>🗄️ Data Retention</h3>", unsafe_allow_html=True)
+    st.toggle(f"Include history (before {hot_cutoff().strftime('%b %d, %Y')})", key="include_archive")
+    if st.button("🗄️ Archive Old Months", use_container_width=True, key="archive_btn"):
+        try:
+            archived_count = archive_old_feedback()
+            if archived_count > 0:
+                invalidate_feedback()
+                load_unarchived_table.clear()
+                fetch_details.clear()
+            st.success(f"Archived {archived_count} submissions")
+        except Exception as e:
+            st.error(f"Archive error: {e}")
+
+    st.markdown("<hr style='border: 1px solid rgba(255,255,255,0.2); margin: 1.5rem 0;'>", unsafe_allow_html=True)
+
     if len(df) > 0:
-        df['sentiment'] = df['rating'].apply(get_sentiment)
-        df['priority'] = df['rating'].apply(get_priority)
-        df['date'] = df['timestamp'].dt.date
+        first_date, last_date = df['date'].min().date(), df['date'].max().date()
 
         st.markdown("<h3 style='color: white; font-size: 1.1rem;'>📅 Date Range</h3>", unsafe_allow_html=True)
         date_filter_option = st.radio("period", ["All Time", "Last 7 Days", "Last 30 Days", "Custom"], 
@@ -274,13 +603,13 @@ with st.sidebar:
         now_ist = datetime.now(IST)
 
         if date_filter_option == "Custom":
-            date_range = st.date_input("range", value=(df['date'].min(), df['date'].max()))
+            date_range = st.date_input("range", value=(first_date, last_date))
         elif date_filter_option == "Last 7 Days":
             date_range = ((now_ist - timedelta(days=7)).date(), now_ist.date())
         elif date_filter_option == "Last 30 Days":
             date_range = ((now_ist - timedelta(days=30)).date(), now_ist.date())
         else:
-            date_range = (df['date'].min(), df['date'].max())
+            date_range = (first_date, last_date)
 
         st.markdown("<hr style='border: 1px solid rgba(255,255,255,0.2); margin: 1rem 0;'>", unsafe_allow_html=True)
 
@@ -298,14 +627,19 @@ with st.sidebar:
         st.markdown("<hr style='border: 1px solid rgba(255,255,255,0.2); margin: 1.5rem 0;'>", unsafe_allow_html=True)
 
         st.markdown("<h3 style='color: white; font-size: 1.1rem;'>📥 Export Data</h3>", unsafe_allow_html=True)
-        csv = df.to_csv(index=False, encoding='utf-8-sig')
-        st.download_button(
-            label="⬇️ Download CSV",
-            data=csv,
-            file_name=f"feedback_{now_ist.strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv",
-            use_container_width=True
-        )
+        if 'export_csv' not in st.session_state:
+            if st.button("📦 Prepare CSV", use_container_width=True, key="prepare_csv"):
+                st.session_state.export_csv = build_export_csv(st.session_state.get('include_archive', False))
+                st.rerun()
+        else:
+            st.download_button(
+                label="⬇️ Download CSV",
+                data=st.session_state.export_csv,
+                file_name=f"feedback_{now_ist.strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+                use_container_width=True,
+                on_click=lambda: st.session_state.pop('export_csv', None)
+            )
 
         st.markdown("<hr style='border: 1px solid rgba(255,255,255,0.2); margin: 1.5rem 0;'>", unsafe_allow_html=True)
 
@@ -351,7 +685,7 @@ try:
     active_priority = st.session_state.get('priority_filter', ["High", "Medium", "Low"]) or ["High", "Medium", "Low"]
 
     if len(date_range) == 2:
-        df_filtered = df[(df['date'] >= date_range[0]) & (df['date'] <= date_range[1])]
+        df_filtered = df[(df['date'] >= pd.Timestamp(date_range[0])) & (df['date'] <= pd.Timestamp(date_range[1]))]
     else:
         df_filtered = df.copy()
 
@@ -369,6 +703,27 @@ try:
 except Exception as e:
     df_filtered = df.copy()
 
+# Daily rollup for time-window cards and trend (sentiment/priority derive from rating)
+def filtered_rollup(start_date, end_date):
+    rollup = load_daily_rollup(start_date, end_date)
+    if rollup is None:
+        rollup = rollup_from_frame(df, start_date, end_date)
+    return rollup[
+        (rollup['rating'].isin(active_rating)) &
+        (rollup['rating'].map(get_sentiment).isin(active_sentiment)) &
+        (rollup['rating'].map(get_priority).isin(active_priority))
+    ]
+
+rollup_start, rollup_end = (date_range[0], date_range[1]) if len(date_range) == 2 else (None, None)
+rollup = filtered_rollup(rollup_start, rollup_end)
+
+# Today / This Week cards read their own small window (<= 8 days x 5 ratings)
+now_ist_date = datetime.now(IST).date()
+week_start = (datetime.now(IST) - timedelta(days=7)).date()
+recent_start = max(week_start, rollup_start) if rollup_start is not None else week_start
+recent_end = min(now_ist_date, rollup_end) if rollup_end is not None else now_ist_date
+recent_rollup = filtered_rollup(recent_start, recent_end)
+
 # Metrics
 col1, col2, col3, col4, col5, col6 = st.columns(6)
 
@@ -388,13 +743,11 @@ with col4:
     st.markdown(f"""<div class="metric-card"><p class="metric-value">{negative_count}</p><p class="metric-label">Urgent</p></div>""", unsafe_allow_html=True)
 
 with col5:
-    now_ist_date = datetime.now(IST).date()
-    today_count = (df_filtered['date'] == now_ist_date).sum()
+    today_count = recent_rollup.loc[recent_rollup['day'] == now_ist_date, 'count'].sum()
     st.markdown(f"""<div class="metric-card"><p class="metric-value">{today_count}</p><p class="metric-label">Today</p></div>""", unsafe_allow_html=True)
 
 with col6:
-    week_start = (datetime.now(IST) - timedelta(days=7)).date()
-    week_count = len(df_filtered[df_filtered['date'] >= week_start])
+    week_count = recent_rollup['count'].sum()
     st.markdown(f"""<div class="metric-card"><p class="metric-value">{week_count}</p><p class="metric-label">This Week</p></div>""", unsafe_allow_html=True)
 
 # Charts
@@ -412,6 +765,7 @@ with col1:
 
 with col2:
     sentiment_counts = df_filtered['sentiment'].value_counts()
+    sentiment_counts = sentiment_counts[sentiment_counts > 0]
     fig = px.pie(values=sentiment_counts.values, names=sentiment_counts.index, title='Sentiment',
                  color_discrete_map={'Positive':'#10b981','Neutral':'#f59e0b','Negative':'#ef4444'})
     fig.update_layout(height=280)
@@ -419,8 +773,9 @@ with col2:
 
 with col3:
     if len(df_filtered) > 1:
-        daily_stats = df_filtered.groupby('date').agg({'rating': ['mean', 'count']}).reset_index()
-        daily_stats.columns = ['date', 'avg_rating', 'count']
+        daily_stats = rollup.groupby('day')[['count', 'rating_sum']].sum().reset_index()
+        daily_stats['avg_rating'] = daily_stats['rating_sum'] / daily_stats['count']
+        daily_stats = daily_stats.rename(columns={'day': 'date'})
         fig = go.Figure()
         fig.add_trace(go.Scatter(x=daily_stats['date'], y=daily_stats['avg_rating'],
             mode='lines+markers', name='Avg Rating', line=dict(color='#667eea', width=2), marker=dict(size=8),
@@ -428,33 +783,46 @@ with col3:
         fig.update_layout(title='Rating Trend', yaxis_range=[0, 5], height=280)
         st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
 
+# Model router health
+model_stats = load_model_stats()
+if len(model_stats) > 0:
+    with st.expander("🤖 AI Model Health", expanded=False):
+        model_stats = model_stats.rename(columns={
+            'route_rank': 'Routing Order', 'pool_rank': 'Pool Position', 'model': 'Model', 'calls': 'Recent Calls',
+            'avg_latency': 'Avg Latency (s)', 'error_rate': 'Error Rate', 'updated_at': 'Updated'
+        })
+        st.dataframe(model_stats[['Routing Order', 'Pool Position', 'Model', 'Recent Calls', 'Avg Latency (s)', 'Error Rate', 'Updated']],
+                     use_container_width=True, hide_index=True)
+
 # Submissions
 st.markdown("<h2 class='section-header'>📝 Submissions</h2>", unsafe_allow_html=True)
 
 tab1, tab2 = st.tabs([f"🔍 Filtered ({len(df_filtered)})", f"📋 All ({len(df)})"])
 
-def display_reviews(dataframe):
+def display_reviews(dataframe, key_prefix):
     if len(dataframe) == 0:
         st.info("No submissions to display")
         return
-    dataframe = dataframe.sort_values('timestamp', ascending=False)
+    dataframe = dataframe.sort_values('ts', ascending=False)
     col1, col2 = st.columns(2)
     for idx, row in dataframe.iterrows():
         target_col = col1 if idx % 2 == 0 else col2
         with target_col:
             priority_emoji = "🔴" if row['priority'] == "High" else "🟡" if row['priority'] == "Medium" else "🟢"
-            time_str = row['timestamp'].strftime('%b %d, %H:%M')
+            time_str = datetime.fromtimestamp(row['ts'], IST).strftime('%b %d, %H:%M')
             with st.expander(f"{priority_emoji} {'⭐' * int(row['rating'])} • {time_str}", expanded=False):
                 st.markdown(f"**📝 Review:** {row['review']}")
                 st.info(f"**🤖 Summary:** {row['ai_summary']}")
-                st.success(f"**💬 Response:** {row['ai_response']}")
-                st.markdown(f"**✅ Actions:**\n{row['recommended_actions']}")
+                if st.toggle("Show response & actions", key=f"{key_prefix}_details_{row['id']}"):
+                    details = fetch_details(int(row['id']))
+                    st.success(f"**💬 Response:** {details.get('ai_response', '')}")
+                    st.markdown(f"**✅ Actions:**\n{details.get('recommended_actions', '')}")
 
 with tab1:
-    display_reviews(df_filtered)
+    display_reviews(df_filtered, "filtered")
 
 with tab2:
-    display_reviews(df)
+    display_reviews(df, "all")
 
 st.markdown("<hr>", unsafe_allow_html=True)
 now_str = datetime.now(IST).strftime('%H:%M:%S')
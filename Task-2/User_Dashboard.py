@@ -66,7 +66,19 @@ client = OpenAI(
     api_key=OPENROUTER_API_KEY,
 )
 
-MODEL_NAME = "google/gemma-3n-e2b-it:free"  # ← OpenRouter free model
+# Ranked pool of OpenRouter free models - earlier entries win ties
+MODEL_POOL = [
+    "google/gemma-3n-e2b-it:free",
+    "google/gemma-3n-e4b-it:free",
+    "meta-llama/llama-3.2-3b-instruct:free",
+    "mistralai/mistral-7b-instruct:free",
+]
+HEDGE_AFTER_SECONDS = 4.0       # minimum wait before firing a backup model
+HEDGE_LATENCY_FACTOR = 1.5      # ...scaled up to 1.5x the chosen model's usual latency
+ROUTER_WORKERS = 32             # shared by all sessions; each call holds 1-2 threads for up to the timeout
+REQUEST_TIMEOUT_SECONDS = 30
+STATS_WINDOW = 20               # rolling calls kept per model
+STATS_TTL_SECONDS = 600         # older calls are forgotten so failed models get retried
 
 # Configure Supabase
 @st.cache_resource
@@ -97,8 +109,67 @@ if 'selected_rating' not in st.session_state:
 
 import requests
 import json
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-def call_openrouter(messages, max_tokens=500, temperature=0.9):
+# Per-call token usage goes to the app log
+logger = logging.getLogger("feedback.llm")
+if not logger.handlers:
+    logger.addHandler(logging.StreamHandler())
+    logger.setLevel(logging.INFO)
+
+@st.cache_resource
+def get_model_router():
+    """Process-wide router state, shared by every user session."""
+    return {
+        "lock": threading.Lock(),
+        "history": {model: deque(maxlen=STATS_WINDOW) for model in MODEL_POOL},
+        "executor": ThreadPoolExecutor(max_workers=ROUTER_WORKERS),
+    }
+
+router = get_model_router()
+
+def record_call(model, latency, ok):
+    with router["lock"]:
+        router["history"][model].append((time.time(), latency, ok))
+
+def model_health(model):
+    """Return (avg_latency, error_rate, calls) over the recent rolling window."""
+    cutoff = time.time() - STATS_TTL_SECONDS
+    with router["lock"]:
+        history = [(lat, ok) for ts, lat, ok in router["history"][model] if ts >= cutoff]
+
+    if not history:
+        return None, 0.0, 0
+    ok_latencies = [lat for lat, ok in history if ok]
+    error_rate = 1 - len(ok_latencies) / len(history)
+    avg_latency = sum(ok_latencies) / len(ok_latencies) if ok_latencies else None
+    return avg_latency, error_rate, len(history)
+
+def rank_models():
+    """Order the pool healthiest-first (latency penalised by error rate)."""
+    def score(rank_model):
+        rank, model = rank_model
+        avg_latency, error_rate, calls = model_health(model)
+        if calls == 0:
+            avg_latency = HEDGE_AFTER_SECONDS  # untried: optimistic, so it gets explored
+        elif avg_latency is None:
+            avg_latency = REQUEST_TIMEOUT_SECONDS
+        return avg_latency * (1 + 4 * error_rate) + rank * 0.01
+
+    return [model for _, model in sorted(enumerate(MODEL_POOL), key=score)]
+
+def hedge_delay(model):
+    """How long to wait on a model before hedging: slow-but-healthy models aren't hedged early."""
+    avg_latency, _, _ = model_health(model)
+    if avg_latency is None:
+        return HEDGE_AFTER_SECONDS
+    return max(HEDGE_AFTER_SECONDS, HEDGE_LATENCY_FACTOR * avg_latency)
+
+def post_openrouter(model, messages, max_tokens, temperature):
+    """Single OpenRouter request. Runs on router threads, so no st.* calls here."""
     url = "https://openrouter.ai/api/v1/chat/completions"
 
     headers = {
@@ -109,36 +180,114 @@ def call_openrouter(messages, max_tokens=500, temperature=0.9):
     }
 
     body = {
-        "model": MODEL_NAME,
+        "model": model,
         "messages": messages,
         "max_tokens": max_tokens,
         "temperature": temperature
     }
 
+    start = time.monotonic()
     try:
-        response = requests.post(url, headers=headers, data=json.dumps(body))
+        response = requests.post(url, headers=headers, data=json.dumps(body), timeout=REQUEST_TIMEOUT_SECONDS)
 
         if response.status_code != 200:
-            st.error(f"OpenRouter Error {response.status_code}: {response.text}")
-            return None
+            raise RuntimeError(f"OpenRouter Error {response.status_code} ({model}): {response.text}")
 
         data = response.json()
-        return data["choices"][0]["message"]["content"].strip()
+        content = data["choices"][0]["message"]["content"].strip()
+        latency = time.monotonic() - start
+        record_call(model, latency, True)
 
-    except Exception as e:
-        st.error(f"Request Failed: {e}")
-        return None
+        usage = data.get("usage") or {}
+        logger.info("openrouter model=%s prompt_tokens=%s completion_tokens=%s est_prompt_tokens=%s latency=%.2fs",
+                    model, usage.get("prompt_tokens"), usage.get("completion_tokens"),
+                    sum(estimate_tokens(m["content"]) for m in messages), latency)
+        return content
+
+    except Exception:
+        record_call(model, time.monotonic() - start, False)
+        raise
+
+
+def call_openrouter(messages, max_tokens=500, temperature=0.9):
+    """Send to the healthiest model; hedge with the runner-up if it is slow or fails."""
+    backups = rank_models()
+    primary = backups.pop(0)
+    delay = hedge_delay(primary)
+    pending = {router["executor"].submit(post_openrouter, primary, messages, max_tokens, temperature)}
+    errors = []
+
+    while pending:
+        done, pending = wait(pending, timeout=delay if backups else None,
+                             return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result()
+            except Exception as e:
+                errors.append(str(e))
+
+        # Nothing answered in time (or the first model failed) - hedge once
+        if backups:
+            pending.add(router["executor"].submit(post_openrouter, backups.pop(0), messages, max_tokens, temperature))
+            backups = []
+
+    st.error(f"Request Failed: {' | '.join(errors)}")
+    return None
+
+def publish_model_stats():
+    """Upsert this process's router stats so the Admin app can display them."""
+    rows = []
+    route_order = rank_models()
+    for rank, model in enumerate(MODEL_POOL):
+        avg_latency, error_rate, calls = model_health(model)
+        rows.append({
+            'model': model,
+            'pool_rank': rank + 1,
+            'route_rank': route_order.index(model) + 1,
+            'calls': calls,
+            'avg_latency': round(avg_latency, 3) if avg_latency is not None else None,
+            'error_rate': round(error_rate, 3),
+            'updated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+    try:
+        supabase.table('model_stats').upsert(rows, on_conflict='model').execute()
+    except Exception:
+        pass  # stats are best-effort; never block a submission on them
+
+
+# --- Prompt budget ---
+MAX_REVIEW_TOKENS = 300   # longer reviews are trimmed before they reach the model
+
+# Identical for all three calls of a submission, so providers can cache the prefix
+SHARED_INSTRUCTIONS = """You are helping a business handle one customer review.
+Only use information that is visible in the review. DO NOT use placeholders like [the place] or [specific detail]. No preamble."""
+
+def estimate_tokens(text):
+    """Local token estimate (~4 characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+def trim_review(review, max_tokens=MAX_REVIEW_TOKENS):
+    """Keep the start and end of an over-long review, where most of the opinion sits."""
+    if estimate_tokens(review) <= max_tokens:
+        return review
+    keep = max_tokens * 4 // 2
+    return f"{review[:keep].rstrip()} [...] {review[-keep:].lstrip()}"
+
+def build_messages(rating, review, task):
+    """Shared prefix (instructions + rating + review) followed by the task-specific part."""
+    return [
+        {"role": "user", "content": f"""{SHARED_INSTRUCTIONS}
 
+Rating: {rating}/5 stars
+Review: "{trim_review(review)}"
+
+{task}"""}
+    ]
 
 def generate_user_response(rating, review):
     """Generate a friendly, empathetic response to the user review."""
-    messages = [
-        {"role": "user", "content": f"""You are an empathetic customer service manager responding to customer reviews.
-
-Write a natural, human-sounding reply (3–4 sentences) to the customer’s review.
+    messages = build_messages(rating, review, """Task: As an empathetic customer service manager, write a natural, human-sounding reply (3–4 sentences) to the customer’s review.
 Your response must be directly based on the rating and the exact details mentioned in the review.
-Rating: {rating}/5 stars
-Review: "{review}"
 
 Guidelines:
 1. SPECIFICALLY mention what the customer talked about
@@ -146,11 +295,9 @@ Guidelines:
 3. If negative (1-2 stars): Apologize SPECIFICALLY and offer a concrete solution
 4. If positive (4-5 stars): Express genuine excitement about what they praised
 5. If neutral (3 stars): Acknowledge mixed feelings and commit to improvement
-6. - DO NOT use placeholders like [the place] or [specific detail], only Output visible information from the Review
-Be conversational, warm, and reference SPECIFIC details. No preamble.
+Be conversational, warm, and reference SPECIFIC details.
 
-Your response:"""}
-    ]
+Your response:""")
 
     for attempt in range(3):
         result = call_openrouter(messages, max_tokens=500, temperature=0.9)
@@ -167,18 +314,10 @@ Your response:"""}
 
 def generate_summary(rating, review):
     """Generate a concise summary for admin dashboard."""
-    messages = [
-        {"role": "user", "content": f"""You are a business analyst creating concise summaries.
-
-Create a summary (15-25 words) of this review:
-
-Rating: {rating}/5 stars
-Review: "{review}"
-
+    messages = build_messages(rating, review, """Task: As a business analyst, create a summary (15-25 words) of this review.
 Focus on SPECIFIC points mentioned. Be concrete and actionable.
 
-Summary:"""}
-    ]
+Summary:""")
 
     for attempt in range(3):
         result = call_openrouter(messages, max_tokens=100, temperature=0.7)
@@ -190,13 +329,7 @@ Summary:"""}
 
 def generate_actions(rating, review):
     """Generate recommended next actions based on feedback."""
-    messages = [
-        {"role": "user", "content": f"""You are a business consultant analyzing customer feedback.
-
-Generate 3 CONCRETE, SPECIFIC action items for this review:
-
-Rating: {rating}/5 stars
-Review: "{review}"
+    messages = build_messages(rating, review, """Task: As a business consultant, generate 3 CONCRETE, SPECIFIC action items for this review.
 
 Requirements:
 1. Reference SPECIFIC issues or praises from the review
@@ -206,8 +339,7 @@ Requirements:
 Format as bullet points (use • not -).
 Each action should be 1-2 lines maximum.
 
-Recommended Actions:"""}
-    ]
+Recommended Actions:""")
 
     for attempt in range(3):
         result = call_openrouter(messages, max_tokens=300, temperature=0.8)
@@ -244,6 +376,18 @@ def save_feedback(rating, review, ai_response, ai_summary, recommended_actions):
 
 def get_stats():
     """Get statistics from database - FIXED VERSION"""
+    # Prefer the feedback_stats RPC: aggregated in the database from the feedback_daily
+    # rollup, so it stays one row however much history (including archived months) exists
+    try:
+        since = (datetime.now() - pd.Timedelta(days=7)).strftime("%Y-%m-%d")
+        response = supabase.rpc('feedback_stats', {'recent_since': since}).execute()
+        stats = response.data[0] if response.data else {}
+        total = int(stats.get('total') or 0)
+        if total > 0:
+            return total, int(stats['rating_sum']) / total, int(stats['recent'] or 0)
+    except Exception:
+        pass
+
     try:
         response = supabase.table('feedback').select('rating, timestamp').execute()
 
@@ -344,6 +488,7 @@ else:
                     st.session_state.submission_complete = True
                     st.session_state.last_response = ai_response
                     st.session_state.last_rating = st.session_state.selected_rating
+                    publish_model_stats()
                     st.rerun()
 
 # ---------------------------------------------------------